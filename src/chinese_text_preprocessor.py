@@ -7,12 +7,28 @@ import jieba
 import re
 import logging
 import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from typing import Set, Tuple
+from typing import FrozenSet, Set, Tuple
 
 # 配置日志，方便调试和查看程序运行状态
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 导入时一次性加载结巴分词词典：以fork启动的进程池子进程直接共享已加载的词典，以spawn启动的子进程在导入本模块时各自加载
+jieba.initialize()
+
+# 全角字符(U+FF01~U+FF5E)与全角空格(U+3000)到半角字符的映射表，供str.translate使用
+_FULL_TO_HALF_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_FULL_TO_HALF_TABLE[0x3000] = 0x20
+
+# 预编译的正则：非字母数字字符或连续数字，以及连续空白
+_NON_WORD_OR_DIGIT = re.compile(r'[^\w\s]|\d+')
+_MULTI_SPACE = re.compile(r'\s+')
+
+# 预编译的正则：形如'I/O'的特殊模式
+_SPECIAL_PATTERN = re.compile(r'([A-Za-z][^\w\s][A-Za-z])')
+
 
 class chinese_text_preprocessor:
     """中文文本预处理类"""
@@ -33,47 +49,44 @@ class chinese_text_preprocessor:
         logging.info("文本预处理器已初始化，使用TF-IDF: {}, ngram范围: {}, 关键词阈值: {}".format(use_tfidf, ngram_range,
                                                                                                  keyword_threshold))
 
-    def load_stop_words(self, file_path: str) -> Set[str]:
+    def load_stop_words(self, file_path: str) -> FrozenSet[str]:
         """加载停用词文件
         :param file_path: 停用词文件路径
         :return: 停用词集合
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                stop_words = {line.strip() for line in file}
+                stop_words = frozenset(line.strip() for line in file)
                 logging.info("加载停用词数量: {}".format(len(stop_words)))
                 return stop_words
         except FileNotFoundError:
             logging.error("未找到停用词文件: {}".format(file_path))
-            return set()
+            return frozenset()
 
     def preprocess(self, text: str) -> Set[str]:
         """对文本进行预处理，包括标准化、去除特殊字符和停用词
         :param text: 原始文本
         :return: 预处理后的文本集合
         """
-        special_patterns = self.extract_special_patterns(text)
-        text = self.cleaned_text  # 使用提取特殊模式后清理的文本
+        special_patterns, text = self.extract_special_patterns(text)  # 使用提取特殊模式后清理的文本
         text = self.normalize_text(text)
         text = self.remove_special_characters(text)
         words = self.remove_stop_words(text)
-        # 去除空字符串
-        words = {word for word in words if word.strip()}
+        # 去除空白词：remove_special_characters已将空白合并为单个空格，分词后的空白词只可能是' '
+        words.discard(' ')
         # 加入特殊模式
         words.update(special_patterns)
         return words
 
-    def extract_special_patterns(self, text: str) -> Set[str]:
+    def extract_special_patterns(self, text: str) -> Tuple[Set[str], str]:
         """提取特定模式如'I/O'并从文本中删除
         :param text: 原始文本
-        :return: 特定模式集合
+        :return: 特定模式集合及删除这些模式后的文本
         """
-        patterns = re.findall(r'([A-Za-z][^\w\s][A-Za-z])', text)
+        patterns = _SPECIAL_PATTERN.findall(text)
         # 从文本中删除这些模式
-        for pattern in patterns:
-            text = text.replace(pattern, '')
-        self.cleaned_text = text  # 保留清理后的文本以供后续处理
-        return set(patterns)
+        text = _SPECIAL_PATTERN.sub('', text)
+        return set(patterns), text
 
     def normalize_text(self, text: str) -> str:
         """文本标准化，包括全角到半角的转换
@@ -88,9 +101,8 @@ class chinese_text_preprocessor:
         :param text: 标准化后的文本
         :return: 清理特殊字符和数字后的文本
         """
-        text = re.sub(r'[^\w\s]', ' ', text)  # 替换所有非字母数字字符为空格
-        text = re.sub(r'\d+', ' ', text)  # 删除所有数字
-        text = re.sub(r'\s+', ' ', text).strip()  # 去除多余空格
+        text = _NON_WORD_OR_DIGIT.sub(' ', text)  # 将所有非字母数字字符和数字替换为空格
+        text = _MULTI_SPACE.sub(' ', text).strip()  # 去除多余空格
         return text
 
     def remove_stop_words(self, text: str) -> Set[str]:
@@ -98,8 +110,7 @@ class chinese_text_preprocessor:
         :param text: 清理特殊字符后的文本
         :return: 去除停用词后的文本集合
         """
-        words = jieba.cut(text)
-        filtered_words = {word for word in words if word not in self.stop_words}
+        filtered_words = set(jieba.lcut(text)).difference(self.stop_words)
         return filtered_words
 
     @staticmethod
@@ -108,9 +119,7 @@ class chinese_text_preprocessor:
         :param s: 原始字符串
         :return: 转换后的字符串
         """
-        return ''.join(
-            chr(ord(char) - 0xfee0 if 0xFF01 <= ord(char) <= 0xFF5E else 32 if ord(char) == 0x3000 else ord(char)) for
-            char in s)
+        return s.translate(_FULL_TO_HALF_TABLE)
 
     def extract_keywords(self, tfidf_matrix, feature_names) -> Set[str]:
         """提取关键词
@@ -124,6 +133,26 @@ class chinese_text_preprocessor:
         return keywords_set
 
 
+# 子进程中使用的预处理器，由 _init_worker 在每个进程启动时创建
+_worker_preprocessor = None
+
+
+def _init_worker(preprocessor_kwargs: dict) -> None:
+    """进程池初始化函数，在每个子进程中实例化一次预处理器
+    :param preprocessor_kwargs: 预处理器的构造参数
+    """
+    global _worker_preprocessor
+    _worker_preprocessor = chinese_text_preprocessor(**preprocessor_kwargs)
+
+
+def _preprocess_question(question: str) -> str:
+    """在子进程中预处理单个问题
+    :param question: 原始问题
+    :return: 以空格连接的处理后词汇集
+    """
+    return ' '.join(_worker_preprocessor.preprocess(question))
+
+
 # 使用示例
 if __name__ == "__main__":
     input_file_path = '../dat/raw_data/testdata.csv'
@@ -138,13 +167,18 @@ if __name__ == "__main__":
             if row:
                 questions.append(row[1].strip())  # 提取每行的问题描述
 
-    # 实例化预处理器
-    preprocessor = chinese_text_preprocessor(use_tfidf=True, ngram_range=(1, 2), keyword_threshold=0.2)
+    # 预处理器参数，每个子进程各自实例化一个预处理器
+    preprocessor_kwargs = {'use_tfidf': True, 'ngram_range': (1, 2), 'keyword_threshold': 0.2}
+
+    # 使用进程池批量预处理所有问题
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(questions) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(preprocessor_kwargs,)) as executor:
+        processed = list(executor.map(_preprocess_question, questions, chunksize=chunksize))
 
-    # 对每个问题进行预处理并存储结果
+    # 一次性写入所有问题及其处理后的词汇集
     with open(output_file_path, 'w', encoding='utf-8', newline='') as file:
         writer = csv.writer(file)
         writer.writerow(['Question', 'Processed Words Set'])  # 写入标题行
-        for question in questions:
-            words_set = preprocessor.preprocess(question)
-            writer.writerow([question, ' '.join(words_set)])  # 将每个问题和其处理后的词汇集写入CSV
+        writer.writerows(zip(questions, processed))
@@ -4,8 +4,9 @@
 # @Function: 本脚本用于比较和识别给定数据集中基于其处理过的词集的相似问题。
 
 import pandas as pd
+import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import logging
 
 # 设置日志配置
@@ -25,7 +26,10 @@ def load_data(filepath):
     返回:
         DataFrame: 载入的数据。
     """
-    data = pd.read_csv(filepath)
+    try:
+        data = pd.read_csv(filepath, engine='pyarrow')  # 多线程解析CSV
+    except ImportError:
+        data = pd.read_csv(filepath)  # 未安装pyarrow时回退到默认的C引擎
     data.columns = [col.strip().replace('"', '') for col in data.columns]
     return data
 
@@ -39,27 +43,43 @@ def vectorize_data(data):
     返回:
         tuple: 向量化后的矩阵和使用的向量器。
     """
-    vectorizer = TfidfVectorizer()
-    return vectorizer.fit_transform(data['Processed Words Set'].tolist()), vectorizer
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    return vectorizer.fit_transform(data['Processed Words Set']), vectorizer
 
 
-def find_high_similarity_pairs(cosine_sim_matrix, data, threshold=0.6):
+def find_high_similarity_pairs(tfidf_matrix, data, threshold=0.6, block_size=1000):
     """识别高余弦相似度的问题对。
 
+    TfidfVectorizer输出的行向量已做L2归一化，因此稀疏矩阵乘积 X @ X.T 即为余弦相似度。
+    按行分块计算乘积，每块只与其后的行相乘并保留上三角（i<j）中超过阈值的元素，内存占用与分块大小和结果数量成正比，
+    而不是与完整的N×N相似度矩阵成正比。
+
     参数:
-        cosine_sim_matrix (array): 余弦相似度矩阵。
+        tfidf_matrix (sparse matrix): L2归一化后的TF-IDF矩阵。
         data (DataFrame): 包含问题的DataFrame。
         threshold (float): 相似度阈值。
+        block_size (int): 每次参与乘积计算的行数。
 
     返回:
         list: 高相似度问题对列表。
     """
-    pairs = []
-    for i in range(len(data)):
-        for j in range(i + 1, len(data)):
-            if cosine_sim_matrix[i, j] > threshold:
-                pairs.append((data.iloc[i]['Question'], data.iloc[j]['Question']))
-    return pairs
+    tfidf_matrix = sparse.csr_matrix(tfidf_matrix)
+    row_parts, col_parts = [], []
+    for start in range(0, tfidf_matrix.shape[0], block_size):
+        # 只与第start行及之后的行相乘，跳过整个下三角区域
+        block = (tfidf_matrix[start:start + block_size] @ tfidf_matrix[start:].T).tocoo()
+        # 块内行列均相对start编号，只有对角子块（列号小于block_size）含有对角线及下三角元素，
+        # 在其余列上 col > row 恒成立
+        mask = (block.data > threshold) & (block.col > block.row)
+        row_parts.append(block.row[mask] + start)
+        col_parts.append(block.col[mask] + start)
+    if not row_parts:
+        return []
+    rows = np.concatenate(row_parts)
+    cols = np.concatenate(col_parts)
+    order = np.lexsort((cols, rows))  # 保证与逐行逐列遍历相同的输出顺序
+    questions = data['Question'].to_numpy()
+    return list(zip(questions[rows[order]], questions[cols[order]]))
 
 
 def main():
@@ -70,30 +90,31 @@ def main():
     logging.info("Vectorizing data.")
     X, vectorizer = vectorize_data(words_data)
 
-    logging.info("Calculating cosine similarity.")
-    cosine_sim = cosine_similarity(X)
-
     logging.info("Finding high similarity pairs.")
-    high_similarity_pairs = find_high_similarity_pairs(cosine_sim, words_data, 0.6)
+    high_similarity_pairs = find_high_similarity_pairs(X, words_data, 0.6)
 
     logging.info(f"Total high similarity pairs found: {len(high_similarity_pairs)}")
 
+    try:
+        # 一次性建立 问题描述 -> 问题ID 的映射，避免每对问题都对整个数据集做子串扫描
+        id_map = {}
+        for description, question_id in zip(test_data['问题描述'].tolist(), test_data['问题ID'].tolist()):
+            if isinstance(description, str):
+                id_map.setdefault(description.strip(), question_id)
+    except KeyError as e:
+        logging.error(f"Column name may be incorrect, check column name: {str(e)}")
+        return
+
     for pair in high_similarity_pairs:
-        try:
-            matched_ids_1 = test_data[test_data['问题描述'].str.contains(pair[0], regex=False, na=False)][
-                '问题ID'].tolist()
-            matched_ids_2 = test_data[test_data['问题描述'].str.contains(pair[1], regex=False, na=False)][
-                '问题ID'].tolist()
-            if matched_ids_1 and matched_ids_2:
-                logging.info(
-                    f"Found question IDs: '{matched_ids_1[0]}': '{pair[0]}', '{matched_ids_2[0]}': '{pair[1]}'")
-            else:
-                if not matched_ids_1:
-                    logging.warning(f"No match found for: {pair[0]}")
-                if not matched_ids_2:
-                    logging.warning(f"No match found for: {pair[1]}")
-        except KeyError as e:
-            logging.error(f"Column name may be incorrect, check column name: {str(e)}")
+        id_1 = id_map.get(pair[0].strip())
+        id_2 = id_map.get(pair[1].strip())
+        if id_1 is not None and id_2 is not None:
+            logging.info(f"Found question IDs: '{id_1}': '{pair[0]}', '{id_2}': '{pair[1]}'")
+        else:
+            if id_1 is None:
+                logging.warning(f"No match found for: {pair[0]}")
+            if id_2 is None:
+                logging.warning(f"No match found for: {pair[1]}")
 
 
 if __name__ == '__main__':
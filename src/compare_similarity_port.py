@@ -3,69 +3,95 @@
 # @Time    : 2024/6/14 15:34
 # @Function: 文本相似度检测脚本，用于检测输入的文本与数据库中文本的相似度
 from flask import Flask, request, jsonify
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import jieba
 import re
 import logging
+from preprocess_cache import PreprocessCache
 
 app = Flask(__name__)
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 服务启动时预先加载结巴分词词典，避免由首个请求承担初始化开销
+jieba.initialize()
+
 # 定义文件路径
 WORDS_SET_PATH = '../dat/words_set/words_set.csv'
 STOP_WORDS_PATH = '../dat/stop_words/stop_words_full.txt'
 
+# 预编译的正则：非字母数字字符或连续数字
+_NON_WORD_OR_DIGIT = re.compile(r'[^\w\s]|\d+')
+
+# 预处理结果缓存的最大条目数
+_PREPROCESS_CACHE_SIZE = 4096
+
 class TextPreprocessor:
     """文本预处理类，负责文本的停用词去除和特殊字符清理"""
 
     def __init__(self, stop_words_file):
         """构造函数：加载停用词文件"""
         self.stop_words = self.load_stop_words(stop_words_file)
+        # 缓存预处理结果，重复的请求直接复用
+        self._preprocess_cache = PreprocessCache(_PREPROCESS_CACHE_SIZE)
 
     def load_stop_words(self, file_path):
         """从指定路径加载停用词集"""
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                stop_words = {line.strip() for line in file}
+                stop_words = frozenset(line.strip() for line in file)
                 logging.info("已加载停用词数量：{}".format(len(stop_words)))
                 return stop_words
         except FileNotFoundError:
             logging.error("找不到停用词文件：{}".format(file_path))
-            return set()
+            return frozenset()
 
     def preprocess(self, text):
+        """对输入的文本进行预处理，结果按文本的SHA-1摘要缓存"""
+        return self._preprocess_cache.get_or_compute(text, self._preprocess)
+
+    def _preprocess(self, text):
         """对输入的文本进行预处理，包括去除数字和特殊字符，使用结巴分词进行中文分词，并去除停用词"""
-        text = re.sub(r'[^\w\s]', ' ', text)  # 去除特殊字符
-        text = re.sub(r'\d+', '', text)  # 去除数字
-        return ' '.join([word for word in jieba.cut(text) if word not in self.stop_words and not word.isspace()])
+        text = _NON_WORD_OR_DIGIT.sub(' ', text)  # 去除特殊字符和数字
+        return ' '.join(word for word in set(jieba.lcut(text)).difference(self.stop_words) if not word.isspace())
 
 def load_data(filepath):
     """从指定路径加载数据集"""
-    data = pd.read_csv(filepath)
+    try:
+        data = pd.read_csv(filepath, engine='pyarrow')  # 多线程解析CSV
+    except ImportError:
+        data = pd.read_csv(filepath)  # 未安装pyarrow时回退到默认的C引擎
     data.columns = [col.strip().replace('"', '') for col in data.columns]
     return data
 
-def vectorize_data(data, input_text, preprocessor):
-    """向量化处理输入文本与数据集，以便进行相似度检测"""
+def fit_vectorizer(data):
+    """在数据集上拟合TF-IDF向量器，返回向量器及数据集的TF-IDF矩阵"""
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    dataset_vector = vectorizer.fit_transform(data['Processed Words Set'])
+    return vectorizer, dataset_vector
+
+def vectorize_data(input_text, preprocessor, vectorizer):
+    """使用已拟合的向量器向量化输入文本，以便进行相似度检测"""
     processed_text = preprocessor.preprocess(input_text)
-    vectorizer = TfidfVectorizer()
-    all_text = data['Processed Words Set'].tolist() + [processed_text]
-    X = vectorizer.fit_transform(all_text)
-    return X[:-1], X[-1], vectorizer
+    return vectorizer.transform([processed_text])
 
 def check_similarity(input_vector, dataset_vector, threshold=0.6):
     """检查输入文本与数据集中文本的相似度，返回相似度结果"""
-    cosine_sim = cosine_similarity(input_vector, dataset_vector)
-    max_similarity = cosine_sim.max()
+    # TF-IDF行向量已做L2归一化，点积即为余弦相似度
+    max_similarity = float((dataset_vector @ input_vector.T).max())
     if max_similarity > threshold:
         return {"error": "输入的文本与现有条目过于相似", "similarity_score": max_similarity}
     else:
         return {"message": "输入的文本具有足够的区别度", "similarity_score": max_similarity}
 
+# 服务启动时一次性加载停用词、数据集并拟合向量器，所有请求共享
+PREPROCESSOR = TextPreprocessor(STOP_WORDS_PATH)
+WORDS_DATA = load_data(WORDS_SET_PATH)
+VECTORIZER, DATASET_VECTOR = fit_vectorizer(WORDS_DATA)
+
 @app.route('/similarity_check', methods=['POST'])
 def similarity_check():
     """处理POST请求，检查文本相似度"""
@@ -73,10 +99,8 @@ def similarity_check():
     if not input_text:
         return jsonify({"error": "未提供文本"}), 400
     try:
-        preprocessor = TextPreprocessor(STOP_WORDS_PATH)
-        words_data = load_data(WORDS_SET_PATH)
-        dataset_vector, input_vector, vectorizer = vectorize_data(words_data, input_text, preprocessor)
-        result = check_similarity(input_vector, dataset_vector)
+        input_vector = vectorize_data(input_text, PREPROCESSOR, VECTORIZER)
+        result = check_similarity(input_vector, DATASET_VECTOR)
         return jsonify(result), 200
     except Exception as e:
         logging.error("处理异常：" + str(e))
@@ -7,11 +7,25 @@ import jieba
 import re
 import logging
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from typing import Set, Tuple
+from typing import FrozenSet, Set, Tuple
 
 # 配置日志，方便调试和查看程序运行状态
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 导入时预先加载结巴分词词典
+jieba.initialize()
+
+# 全角字符(U+FF01~U+FF5E)与全角空格(U+3000)到半角字符的映射表，供str.translate使用
+_FULL_TO_HALF_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_FULL_TO_HALF_TABLE[0x3000] = 0x20
+
+# 预编译的正则：非字母数字字符或连续数字，以及连续空白
+_NON_WORD_OR_DIGIT = re.compile(r'[^\w\s]|\d+')
+_MULTI_SPACE = re.compile(r'\s+')
+
+# 预编译的正则：形如'I/O'的特殊模式
+_SPECIAL_PATTERN = re.compile(r'([A-Za-z][^\w\s][A-Za-z])')
+
 
 class input_processor:
     """中文文本预处理类，支持停用词去除、特殊字符清理、关键词提取等功能"""
@@ -33,7 +47,7 @@ class input_processor:
         logging.info("文本预处理器已初始化，使用TF-IDF: {}, ngram范围: {}, 关键词阈值: {}".format(use_tfidf, ngram_range,
                                                                                                  keyword_threshold))
 
-    def load_stop_words(self, file_path: str) -> Set[str]:
+    def load_stop_words(self, file_path: str) -> FrozenSet[str]:
         """
         加载停用词文件
         :param file_path: 停用词文件路径
@@ -41,12 +55,12 @@ class input_processor:
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                stop_words = {line.strip() for line in file}
+                stop_words = frozenset(line.strip() for line in file)
                 logging.info("加载停用词数量: {}".format(len(stop_words)))
                 return stop_words
         except FileNotFoundError:
             logging.error("未找到停用词文件: {}".format(file_path))
-            return set()
+            return frozenset()
 
     def preprocess(self, text: str) -> Set[str]:
         """
@@ -54,26 +68,23 @@ class input_processor:
         :param text: 原始文本
         :return: 预处理后的文本集合
         """
-        special_patterns = self.extract_special_patterns(text)
-        text = self.cleaned_text  # 使用提取特殊模式后清理的文本
+        special_patterns, text = self.extract_special_patterns(text)  # 使用提取特殊模式后清理的文本
         text = self.normalize_text(text)
         text = self.remove_special_characters(text)
         words = self.remove_stop_words(text)
-        words = {word for word in words if word.strip()}  # 去除空字符串
+        words.discard(' ')  # 去除空白词，空白已在remove_special_characters中合并为单个空格
         words.update(special_patterns)  # 加入特殊模式
         return words
 
-    def extract_special_patterns(self, text: str) -> Set[str]:
+    def extract_special_patterns(self, text: str) -> Tuple[Set[str], str]:
         """
         提取特定模式如'I/O'并从文本中删除
         :param text: 原始文本
-        :return: 特定模式集合
+        :return: 特定模式集合及删除这些模式后的文本
         """
-        patterns = re.findall(r'([A-Za-z][^\w\s][A-Za-z])', text)
-        for pattern in patterns:
-            text = text.replace(pattern, '')
-        self.cleaned_text = text  # 保留清理后的文本以供后续处理
-        return set(patterns)
+        patterns = _SPECIAL_PATTERN.findall(text)
+        text = _SPECIAL_PATTERN.sub('', text)
+        return set(patterns), text
 
     def normalize_text(self, text: str) -> str:
         """
@@ -90,9 +101,8 @@ class input_processor:
         :param text: 标准化后的文本
         :return: 清理特殊字符和数字后的文本
         """
-        text = re.sub(r'[^\w\s]', ' ', text)  # 替换所有非字母数字字符为空格
-        text = re.sub(r'\d+', ' ', text)  # 删除所有数字
-        text = re.sub(r'\s+', ' ', text).strip()  # 去除多余空格
+        text = _NON_WORD_OR_DIGIT.sub(' ', text)  # 将所有非字母数字字符和数字替换为空格
+        text = _MULTI_SPACE.sub(' ', text).strip()  # 去除多余空格
         return text
 
     def remove_stop_words(self, text: str) -> Set[str]:
@@ -101,8 +111,7 @@ class input_processor:
         :param text: 清理特殊字符后的文本
         :return: 去除停用词后的文本集合
         """
-        words = jieba.cut(text)
-        filtered_words = {word for word in words if word not in self.stop_words}
+        filtered_words = set(jieba.lcut(text)).difference(self.stop_words)
         return filtered_words
 
     @staticmethod
@@ -112,9 +121,7 @@ class input_processor:
         :param s: 原始字符串
         :return: 转换后的字符串
         """
-        return ''.join(
-            chr(ord(char) - 0xfee0 if 0xFF01 <= ord(char) <= 0xFF5E else 32 if ord(char) == 0x3000 else ord(char)) for
-            char in s)
+        return s.translate(_FULL_TO_HALF_TABLE)
 
 
 def main():
@@ -9,13 +9,32 @@ import jieba
 import re
 import logging
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from typing import Set, Tuple
+from typing import FrozenSet, Set, Tuple
+from preprocess_cache import PreprocessCache
 
 app = Flask(__name__)
 
 # 配置日志记录，包括时间、日志级别和日志信息
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 服务启动时预先加载结巴分词词典，避免由首个请求承担初始化开销
+jieba.initialize()
+
+# 全角字符(U+FF01~U+FF5E)与全角空格(U+3000)到半角字符的映射表，供str.translate使用
+_FULL_TO_HALF_TABLE = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+_FULL_TO_HALF_TABLE[0x3000] = 0x20
+
+# 预编译的正则：非字母数字字符或连续数字，以及连续空白
+_NON_WORD_OR_DIGIT = re.compile(r'[^\w\s]|\d+')
+_MULTI_SPACE = re.compile(r'\s+')
+
+# 预编译的正则：形如'I/O'的特殊模式，以及IPv4地址
+_SPECIAL_PATTERN = re.compile(r'([A-Za-z][^\w\s][A-Za-z])')
+_IP_PATTERN = re.compile(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b')
+
+# 预处理结果缓存的最大条目数
+_PREPROCESS_CACHE_SIZE = 4096
+
 class InputProcessor:
     def __init__(self, stop_words_file: str = '../dat/stop_words/stop_words_full.txt', use_tfidf: bool = True,
                  ngram_range: Tuple[int, int] = (1, 1), keyword_threshold: float = 0.1):
@@ -26,63 +45,66 @@ class InputProcessor:
                                           ngram_range=ngram_range) if use_tfidf else CountVectorizer(
             tokenizer=jieba.cut, stop_words=self.stop_words, ngram_range=ngram_range)
         self.keyword_threshold = keyword_threshold
+        # 缓存预处理结果，重复的请求直接复用
+        self._preprocess_cache = PreprocessCache(_PREPROCESS_CACHE_SIZE)
 
-    def load_stop_words(self, file_path: str) -> Set[str]:
+    def load_stop_words(self, file_path: str) -> FrozenSet[str]:
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
-                stop_words = {line.strip() for line in file}
+                stop_words = frozenset(line.strip() for line in file)
                 logging.info("Stop words loaded successfully.")
                 return stop_words
         except FileNotFoundError:
             logging.error(f"Stop words file not found: {file_path}")
-            return set()
+            return frozenset()
 
     def preprocess(self, text: str) -> Set[str]:
+        # 返回缓存结果的副本，调用方可以安全地修改
+        return set(self._preprocess_cache.get_or_compute(text, self._preprocess))
+
+    def _preprocess(self, text: str) -> FrozenSet[str]:
         text = self.extract_special_patterns(text)
         text = self.normalize_text(text)
         text = self.remove_special_characters(text)
         words = self.remove_stop_words(text)
-        return {word for word in words if word.strip()}  # 过滤掉空字符串
+        words.discard(' ')  # 过滤掉空白词，空白已在remove_special_characters中合并为单个空格
+        return frozenset(words)
 
     def extract_special_patterns(self, text: str) -> str:
         # 提取并删除文本中的特殊模式
-        patterns = re.findall(r'([A-Za-z][^\w\s][A-Za-z])', text)
-        for pattern in patterns:
-            text = text.replace(pattern, '')
+        text = _SPECIAL_PATTERN.sub('', text)
         return text
 
     def extract_ip_addresses(self, text: str) -> Set[str]:
         # 提取文本中的IP地址
-        ip_pattern = r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b'
-        ips = set(re.findall(ip_pattern, text))
+        ips = set(_IP_PATTERN.findall(text))
         if ips:
             logging.info(f"IP addresses extracted: {ips}")
         return ips
 
     def normalize_text(self, text: str) -> str:
         # 正规化文本，转换全角字符和空格
-        normalized_text = ''.join(
-            chr(ord(char) - 0xfee0 if 0xFF01 <= ord(char) <= 0xFF5E else 32 if ord(char) == 0x3000 else ord(char)) for
-            char in text)
+        normalized_text = text.translate(_FULL_TO_HALF_TABLE)
         logging.debug(f"Text normalized: {normalized_text}")
         return normalized_text
 
     def remove_special_characters(self, text: str) -> str:
         # 移除特殊字符和数字，合并空格
-        text = re.sub(r'[^\w\s]', ' ', text)  # 替换所有非字母数字字符为空格
-        text = re.sub(r'\d+', ' ', text)  # 删除所有数字
-        text = re.sub(r'\s+', ' ', text).strip()  # 去除多余空格
+        text = _NON_WORD_OR_DIGIT.sub(' ', text)  # 将所有非字母数字字符和数字替换为空格
+        text = _MULTI_SPACE.sub(' ', text).strip()  # 去除多余空格
         logging.debug(f"Special characters removed: {text}")
         return text
 
     def remove_stop_words(self, text: str) -> Set[str]:
         # 移除停用词
-        words = jieba.cut(text)
-        filtered_words = {word for word in words if word not in self.stop_words}
+        filtered_words = set(jieba.lcut(text)).difference(self.stop_words)
         logging.debug(f"Stop words removed. Words remaining: {filtered_words}")
         return filtered_words
 
 
+# 服务启动时实例化一次处理器，所有请求共享，避免每次请求重复加载停用词
+PROCESSOR = InputProcessor(use_tfidf=True, ngram_range=(1, 2), keyword_threshold=0.2)
+
 @app.route('/process', methods=['POST'])
 def process_text():
     data = request.json
@@ -91,8 +113,7 @@ def process_text():
         logging.error("No text provided in the request.")
         return jsonify({'error': 'No text provided'}), 400
 
-    processor = InputProcessor(use_tfidf=True, ngram_range=(1, 2), keyword_threshold=0.2)
-    processed_text = processor.preprocess(text)
+    processed_text = PROCESSOR.preprocess(text)
     processed_text.add('%ip')  # 特殊键值添加
     response_data = {'processed_text': list(processed_text)}
     logging.info("Text processed successfully.")
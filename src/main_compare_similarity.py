@@ -4,13 +4,13 @@
 # @Function: 与Flask服务交互的外部脚本，用于检查文本相似度
 
 import requests
-import json
+
+# 模块级会话，复用TCP连接池（keep-alive），避免每次请求重新建立连接
+_SESSION = requests.Session()
 
 def check_text_similarity(input_text, url='http://127.0.0.1:5000/similarity_check'):
     """发送POST请求到Flask应用以检查文本相似度"""
-    headers = {'Content-Type': 'application/json'}
-    data = json.dumps({'text': input_text})
-    response = requests.post(url, headers=headers, data=data)
+    response = _SESSION.post(url, json={'text': input_text})
     if response.status_code == 200:
         return response.json()
     else:
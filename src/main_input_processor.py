@@ -5,13 +5,13 @@
 
 
 import requests
-import json
+
+# 模块级会话，复用TCP连接池（keep-alive），避免每次请求重新建立连接
+_SESSION = requests.Session()
 
 def process_text(input_text, url='http://127.0.0.1:5000/process'):
     """发送POST请求到Flask应用以进行文本预处理"""
-    headers = {'Content-Type': 'application/json'}
-    data = json.dumps({'text': input_text})
-    response = requests.post(url, headers=headers, data=data)
+    response = _SESSION.post(url, json={'text': input_text})
     if response.status_code == 200:
         return response.json()
     else:
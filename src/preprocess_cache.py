@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# @Author  : Wenzhuo Ma
+# @Time    : 2026/10/15
+# @Function: 预处理结果缓存，供Flask服务复用重复请求的预处理结果
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class PreprocessCache:
+    """按输入文本SHA-1摘要缓存结果的线程安全LRU缓存，缓存键不保留原文
+
+    JSON请求体可以合法地携带孤立的代理字符，计算缓存键时同样需要支持：
+
+    >>> cache = PreprocessCache(maxsize=2)
+    >>> cache.get_or_compute('查找\\ud800设备', len)
+    5
+    >>> cache.get_or_compute('查找\\ud800设备', lambda text: 0)  # 命中缓存，不再重新计算
+    5
+    >>> cache.get_or_compute('a', len), cache.get_or_compute('bb', len)
+    (1, 2)
+    >>> cache.get_or_compute('查找\\ud800设备', lambda text: 0)  # 超出容量后最久未使用的条目被淘汰
+    0
+    """
+
+    def __init__(self, maxsize=4096):
+        """构造函数：maxsize为缓存的最大条目数"""
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text):
+        """计算文本的缓存键；surrogatepass 使含孤立代理字符的文本也能编码"""
+        return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).digest()
+
+    def get_or_compute(self, text, compute):
+        """返回text对应的缓存结果，未命中时调用compute(text)计算并写入缓存"""
+        key = self.make_key(text)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+        if result is None:
+            result = compute(text)
+            with self._lock:
+                self._entries[key] = result
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return result
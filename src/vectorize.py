@@ -4,9 +4,10 @@
 # @Function: 本脚本使用TF-IDF向量化和余弦相似度计算，根据给定的已处理输入找出数据集中最相似的问题。
 
 import sys
-import pandas as pd
+import csv
+from functools import lru_cache
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import logging
 
 # 配置日志，为调试提供详细信息
@@ -18,42 +19,57 @@ def load_data(file_path):
     参数:
         file_path (str): 包含数据的CSV文件路径。
     返回:
-        DataFrame: 包含加载数据的pandas DataFrame。
+        tuple: 问题列表和对应的已处理词汇集列表。
     异常:
         Exception: 如果文件加载失败，记录错误并退出程序。
     """
     try:
-        return pd.read_csv(file_path)
+        # utf-8-sig 兼容Excel保存的带BOM的CSV文件
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+            reader = csv.reader(file)
+            header = [col.strip().replace('"', '') for col in next(reader)]
+            question_col = header.index('Question')
+            processed_col = header.index('Processed Words Set')
+            min_columns = max(question_col, processed_col) + 1
+            questions, processed = [], []
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < min_columns:
+                    raise ValueError(f"第 {reader.line_num} 行列数不足，需要至少 {min_columns} 列: {row}")
+                questions.append(row[question_col])
+                processed.append(row[processed_col])
+        return questions, processed
     except Exception as e:
         logging.error(f"从 {file_path} 加载数据失败: {e}")
         raise  # 这将错误传递给调用者，可以决定如何处理
 
 
-def vectorize_data(data):
+def vectorize_data(processed):
     """使用TF-IDF向量化文本数据。
     参数:
-        data (DataFrame): 包含文本数据列'Processed Words Set'的pandas DataFrame。
+        processed (list): 已处理词汇集（以空格连接的字符串）列表。
     返回:
         tuple: 包含向量器(TfidfVectorizer对象)和TF-IDF矩阵的元组。
     异常:
         Exception: 如果向量化失败，记录错误并退出程序。
     """
     try:
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(data['Processed Words Set'])
+        vectorizer = TfidfVectorizer(dtype=np.float32)  # 单精度矩阵，减半相似度计算的内存带宽
+        tfidf_matrix = vectorizer.fit_transform(processed)
         return vectorizer, tfidf_matrix
     except Exception as e:
         logging.error(f"数据向量化失败: {e}")
         raise
 
 
-def find_most_similar_questions(new_input, vectorizer, tfidf_matrix, data, top_n=5):
+def find_most_similar_questions(new_input, vectorizer, tfidf_matrix, questions, top_n=5):
     """基于TF-IDF向量的余弦相似度找出最相似的问题。
     参数:
         new_input (str): 要比较的已处理输入文本。
         vectorizer (TfidfVectorizer): 用于转换文本数据的向量器。
         tfidf_matrix (array): 从数据集向量化得到的TF-IDF矩阵。
-        data (DataFrame): 原始数据集的DataFrame。
+        questions (list): 与TF-IDF矩阵各行对应的原始问题列表。
         top_n (int): 返回的最相似问题的数量。
     返回:
         list: 包含最相似问题及其相似度得分的列表。
@@ -62,23 +78,41 @@ def find_most_similar_questions(new_input, vectorizer, tfidf_matrix, data, top_n
     """
     try:
         new_input_tfidf = vectorizer.transform([new_input])
-        cosine_similarities = cosine_similarity(new_input_tfidf, tfidf_matrix).flatten()
-        top_indices = cosine_similarities.argsort()[-top_n:][::-1]
-        return [(data.iloc[index]['Question'], cosine_similarities[index]) for index in top_indices]
+        # TF-IDF行向量已做L2归一化，稀疏点积即为余弦相似度
+        cosine_similarities = (tfidf_matrix @ new_input_tfidf.T).toarray().ravel()
+        top_n = min(top_n, cosine_similarities.size)
+        if top_n <= 0:
+            return []
+        # 先用argpartition选出前top_n个候选，再只对这top_n个排序
+        candidates = np.argpartition(-cosine_similarities, top_n - 1)[:top_n]
+        top_indices = candidates[np.argsort(-cosine_similarities[candidates])]
+        return [(questions[index], cosine_similarities[index]) for index in top_indices]
     except Exception as e:
         logging.error(f"查找相似问题时出错: {e}")
         raise
 
 
+@lru_cache(maxsize=None)
+def load_model(file_path):
+    """加载数据并拟合TF-IDF向量器，结果按文件路径缓存，重复调用时共享同一个已拟合的模型。
+    参数:
+        file_path (str): 包含数据的CSV文件路径。
+    返回:
+        tuple: 包含问题列表、向量器和TF-IDF矩阵的元组。
+    """
+    questions, processed = load_data(file_path)
+    vectorizer, tfidf_matrix = vectorize_data(processed)
+    return questions, vectorizer, tfidf_matrix
+
+
 def main(processed_input):
     """主函数，加载数据，向量化并找出相似问题。
     参数:
         processed_input (str): 需要找出相似问题的已处理文本输入。
     """
     file_path = '../dat/words_set/words_set.csv'
-    data = load_data(file_path)
-    vectorizer, tfidf_matrix = vectorize_data(data)
-    similar_questions = find_most_similar_questions(processed_input, vectorizer, tfidf_matrix, data)
+    questions, vectorizer, tfidf_matrix = load_model(file_path)
+    similar_questions = find_most_similar_questions(processed_input, vectorizer, tfidf_matrix, questions)
     for question, similarity in similar_questions:
         logging.info(f"{question}: 相似度 = {similarity}")
 